@@ -0,0 +1,2 @@
+# The Rocky Point scripts fetch live pages from Surfline and are run by hand
+collect_ignore = ['test_rocky_point.py', 'test_improved_extraction.py']
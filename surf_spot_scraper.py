@@ -5,19 +5,380 @@ Processes surf spots from JSON file and enriches them with data from Surfline sp
 """
 
 import json
+import fcntl
+import gzip
+import math
+import mmap
 import requests
 import cloudscraper
 import time
 import re
+import zlib
 import random
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs
 import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
+# Spots enriched more recently than this are not refreshed by the scheduler
+DEFAULT_MIN_REFRESH_AGE = 24 * 3600
+# Failing spots are retried after FAILURE_BACKOFF_BASE * 2**(failures - 1), capped at MAX_FAILURE_BACKOFF
+FAILURE_BACKOFF_BASE = 15 * 60
+MAX_FAILURE_BACKOFF = 6 * 3600
+# A budgeted run stops after this many failures in a row, which points to an outage or a block
+MAX_CONSECUTIVE_FAILURES = 3
+# Page requests per spot: (spot guide + main report) x (cloudscraper + session)
+MAX_REQUESTS_PER_SPOT = 4
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Source list of surf spots enriched by main()
+SPOTS_JSON_FILE = "/Users/frederic/github/lavolcanica/docs/surf-spots-coordinates-google-map/surfline fuerteventura surf spots.json"
+
+# Fields every page archive index entry must carry to be usable
+ARCHIVE_INDEX_KEYS = ('spot_url', 'fetch_time', 'offset', 'length')
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as '90s', '10m', '2h' or '1d' into seconds"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhd]?)', value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2) or 's']
+
+
+def parse_budget(value: str) -> Tuple[Optional[float], Optional[int]]:
+    """Parse a --budget value into (seconds, max_requests)
+
+    Durations ('10m', '1h') give a wall-clock budget, counts suffixed with
+    'req' ('40req') give a budget of HTTP requests.
+    """
+    match = re.fullmatch(r'(\d+)\s*req(?:uests?)?', value.strip().lower())
+    if match:
+        return None, int(match.group(1))
+    return parse_duration(value), None
+
+
+class RefreshScheduler:
+    """Rank surf spots by staleness and persist refresh state between runs
+
+    Each spot in the source JSON may carry an optional numeric "priority"
+    field (default 1.0); a spot with priority 2 is refreshed as urgently as
+    one twice as stale. Spots that keep failing rank lower and are retried
+    after a short exponential backoff.
+    """
+
+    def __init__(self, state_file_path: str, min_age: float = DEFAULT_MIN_REFRESH_AGE):
+        self.state_file_path = state_file_path
+        self.min_age = min_age
+        self.state = self.load_state()
+        # Spots changed by this run, merged into the state file on save
+        self.dirty_urls = set()
+
+    def load_state(self) -> Dict:
+        """Load the refresh state, starting afresh if it is missing or unreadable"""
+        if not os.path.exists(self.state_file_path):
+            return {'spots': {}}
+
+        try:
+            with open(self.state_file_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            state.setdefault('spots', {})
+            return state
+        except (OSError, ValueError) as e:
+            print(f"Could not read refresh state {self.state_file_path}: {e}")
+            return {'spots': {}}
+
+    def save_state(self):
+        """Merge this run's changes into the state file under an exclusive lock
+
+        Overlapping runs would otherwise overwrite each other's updates; the
+        file is replaced atomically so an interrupted run cannot corrupt it.
+        """
+        with open(self.state_file_path + '.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            state = self.load_state()
+            state.update({key: value for key, value in self.state.items() if key != 'spots'})
+            for url in self.dirty_urls:
+                state['spots'][url] = self.state['spots'][url]
+
+            tmp_path = self.state_file_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.state_file_path)
+
+        self.state = state
+        self.dirty_urls.clear()
+
+    def seed_from_enrichment(self, enriched_data: Dict):
+        """Seed last_success from a previous enriched output the first time the scheduler runs
+
+        Only spots the scheduler has never attempted are seeded, using the
+        output's enrichment_date, so adopting the scheduler after a full
+        scrape does not refetch spots that are still fresh.
+        """
+        if self.state.get('seeded'):
+            return
+        self.state['seeded'] = True
+
+        enrichment_date = enriched_data.get('enrichment_info', {}).get('enrichment_date')
+        try:
+            enriched_at = time.mktime(time.strptime(enrichment_date, '%Y-%m-%d %H:%M:%S')) if enrichment_date else None
+        except ValueError:
+            print(f"Could not parse enrichment date {enrichment_date!r}, not seeding refresh state")
+            enriched_at = None
+
+        if enriched_at is not None:
+            for spot in enriched_data.get('surf_spots', []):
+                if 'url' not in spot or 'surfline_characteristics' not in spot:
+                    continue
+                spot_state = self.state['spots'].setdefault(spot['url'], {})
+                if 'last_success' in spot_state or 'last_attempt' in spot_state:
+                    continue
+                spot_state.setdefault('name', spot.get('name', 'Unknown'))
+                spot_state.setdefault('first_seen', enriched_at)
+                spot_state['last_success'] = enriched_at
+                self.dirty_urls.add(spot['url'])
+
+        self.save_state()
+
+    def get_spot_state(self, spot: Dict) -> Dict:
+        """Get the stored refresh state for a spot, keyed by its Surfline URL"""
+        return self.state['spots'].get(spot['url'], {})
+
+    def get_spot_age(self, spot: Dict, now: float) -> float:
+        """Seconds since the last successful enrichment of a spot
+
+        A spot that has never been enriched counts as having become due when
+        it was first seen, so it competes fairly with spots whose enrichment
+        has just expired and grows staler from there.
+        """
+        spot_state = self.get_spot_state(spot)
+        last_success = spot_state.get('last_success')
+        if last_success is None:
+            return self.min_age + max(0.0, now - spot_state.get('first_seen', now))
+        return max(0.0, now - last_success)
+
+    def is_due(self, spot: Dict, now: float) -> bool:
+        """Check whether a spot is stale enough, and far enough past its last failure, to refresh"""
+        spot_state = self.get_spot_state(spot)
+        failures = spot_state.get('failures', 0)
+        if failures:
+            backoff = min(FAILURE_BACKOFF_BASE * 2 ** (failures - 1), MAX_FAILURE_BACKOFF)
+            if now - spot_state.get('last_attempt', 0) < backoff:
+                return False
+        return spot_state.get('last_success') is None or self.get_spot_age(spot, now) >= self.min_age
+
+    def get_spot_priority(self, spot: Dict) -> float:
+        """Get the priority weight of a spot, falling back to 1.0 for invalid values"""
+        priority = spot.get('priority', 1.0)
+        try:
+            priority = float(priority)
+        except (TypeError, ValueError):
+            priority = None
+
+        if priority is None or not math.isfinite(priority) or priority <= 0:
+            print(f"Invalid priority {spot.get('priority')!r} for {spot.get('name', 'Unknown')}, using 1.0")
+            return 1.0
+        return priority
+
+    def score_spot(self, spot: Dict, now: float) -> float:
+        """Score a spot for refresh: staler and higher priority first, repeated failures later"""
+        failures = self.get_spot_state(spot).get('failures', 0)
+        return self.get_spot_priority(spot) * self.get_spot_age(spot, now) / (1 + failures)
+
+    def rank_spots(self, spots: List[Dict], now: float = None) -> List[Dict]:
+        """Return the spots due for refresh, most urgent first"""
+        if now is None:
+            now = time.time()
+
+        # Remember when new spots first appeared so their staleness can grow
+        new_spots = [spot for spot in spots if spot['url'] not in self.state['spots']]
+        for spot in new_spots:
+            self.state['spots'][spot['url']] = {'name': spot.get('name', 'Unknown'), 'first_seen': now}
+            self.dirty_urls.add(spot['url'])
+        if new_spots:
+            self.save_state()
+
+        due_spots = [spot for spot in spots if self.is_due(spot, now)]
+        scores = {spot['url']: self.score_spot(spot, now) for spot in due_spots}
+        return sorted(due_spots, key=lambda spot: scores[spot['url']], reverse=True)
+
+    def record_result(self, spot: Dict, success: bool, now: float = None):
+        """Record the outcome of a refresh attempt and persist the state"""
+        if now is None:
+            now = time.time()
+
+        spot_state = self.state['spots'].setdefault(spot['url'], {})
+        spot_state.setdefault('first_seen', now)
+        spot_state['name'] = spot.get('name', 'Unknown')
+        spot_state['last_attempt'] = now
+        if success:
+            spot_state['last_success'] = now
+            spot_state['failures'] = 0
+        else:
+            spot_state['failures'] = spot_state.get('failures', 0) + 1
+
+        self.dirty_urls.add(spot['url'])
+        self.save_state()
+
+
+class PageArchive:
+    """Append-only archive of fetched pages for offline re-extraction
+
+    Each page is stored as its own gzip member holding a WARC-like record
+    (header block, blank line, raw body), so the archive stays a valid
+    .gz file and any record can be decompressed on its own. A JSON-lines
+    index beside the archive maps spot URL and fetch time to the member's
+    byte offset and length; reads slice the member out of a memory map.
+    """
+
+    def __init__(self, archive_file_path: str, load_index: bool = True):
+        """Re-extraction workers pass load_index=False, as they are handed their index entries"""
+        self.archive_file_path = archive_file_path
+        self.index_file_path = archive_file_path + '.idx'
+        self.index = self.load_index() if load_index else {}
+        self._mmap = None
+
+    def load_index(self) -> Dict[str, List[Dict]]:
+        """Load the offset index, grouping records by spot URL in fetch order"""
+        index = {}
+        if not os.path.exists(self.index_file_path):
+            return index
+
+        with open(self.index_file_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A truncated last line is left behind by an interrupted write
+                    print(f"Skipping unreadable index line {line_number} in {self.index_file_path}")
+                    continue
+                if not isinstance(entry, dict) or any(key not in entry for key in ARCHIVE_INDEX_KEYS):
+                    print(f"Skipping incomplete index line {line_number} in {self.index_file_path}")
+                    continue
+                index.setdefault(entry['spot_url'], []).append(entry)
+
+        for entries in index.values():
+            entries.sort(key=lambda entry: entry['fetch_time'])
+        return index
+
+    def append(self, spot_url: str, url: str, content: bytes, status: int = 200,
+               fetch_time: float = None) -> Dict:
+        """Append a fetched page to the archive and record it in the index"""
+        if fetch_time is None:
+            fetch_time = time.time()
+
+        fetch_date = datetime.fromtimestamp(fetch_time, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        header = (
+            'WARC/1.1\r\n'
+            'WARC-Type: response\r\n'
+            f'WARC-Target-URI: {url}\r\n'
+            f'WARC-Date: {fetch_date}\r\n'
+            f'X-Spot-URL: {spot_url}\r\n'
+            f'X-HTTP-Status: {status}\r\n'
+            f'Content-Length: {len(content)}\r\n'
+            '\r\n'
+        ).encode('utf-8')
+        member = gzip.compress(header + content + b'\r\n\r\n')
+
+        with open(self.archive_file_path, 'ab') as f:
+            # Overlapping runs share the archive: hold the lock until the index line is written
+            fcntl.flock(f, fcntl.LOCK_EX)
+            offset = f.seek(0, os.SEEK_END)
+            f.write(member)
+            f.flush()
+
+            entry = {
+                'spot_url': spot_url,
+                'url': url,
+                'fetch_time': fetch_time,
+                'status': status,
+                'offset': offset,
+                'length': len(member)
+            }
+            with open(self.index_file_path, 'a', encoding='utf-8') as index_file:
+                index_file.write(json.dumps(entry) + '\n')
+
+        self.index.setdefault(spot_url, []).append(entry)
+        # The archive has grown past the end of any existing map
+        self.close()
+        return entry
+
+    def latest(self, spot_url: str, before: float = None) -> Optional[Dict]:
+        """Get the index entry of the most recent page fetched for a spot"""
+        entries = self.index.get(spot_url, [])
+        if before is not None:
+            entries = [entry for entry in entries if entry['fetch_time'] <= before]
+        return entries[-1] if entries else None
+
+    def read(self, entry: Dict) -> Optional[bytes]:
+        """Read the raw page body of an index entry from the memory-mapped archive
+
+        Returns None if the archive is missing or the record is truncated or corrupt.
+        """
+        try:
+            if self._mmap is None:
+                with open(self.archive_file_path, 'rb') as f:
+                    # Mapping an empty file raises ValueError
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            member = self._mmap[entry['offset']:entry['offset'] + entry['length']]
+            if len(member) != entry['length']:
+                raise EOFError(f"archive ends {entry['length'] - len(member)} bytes before the end of the record")
+            record = gzip.decompress(member)
+        except (OSError, EOFError, ValueError, zlib.error) as e:
+            # gzip.BadGzipFile is an OSError
+            print(f"Could not read archived page {entry.get('url', entry['spot_url'])}: {e}")
+            return None
+
+        header, _, body = record.partition(b'\r\n\r\n')
+        content_length = re.search(rb'Content-Length: (\d+)', header)
+        return body[:int(content_length.group(1))] if content_length else body
+
+    def close(self):
+        """Release the memory map"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+# Per-process state for parallel re-extraction workers
+_reextract_scraper = None
+_reextract_archive = None
+
+
+def _init_reextract_worker(json_file_path: str, archive_file_path: str):
+    """Set up an offline scraper and a private, index-free view of the archive in a worker process"""
+    global _reextract_scraper, _reextract_archive
+    _reextract_scraper = SurfSpotScraper(json_file_path, offline=True)
+    _reextract_archive = PageArchive(archive_file_path, load_index=False)
+
+
+def _reextract_spot(spot: Dict, entry: Dict) -> Optional[Dict]:
+    """Run the current extraction over an archived page in a worker process"""
+    content = _reextract_archive.read(entry)
+    if content is None:
+        return None
+
+    soup = BeautifulSoup(content, 'html.parser')
+    return _reextract_scraper.enrich_spot(spot, soup)
+
+
 class SurfSpotScraper:
-    def __init__(self, json_file_path: str):
+    def __init__(self, json_file_path: str, archive_file_path: str = None, offline: bool = False):
+        """Offline scrapers only run extraction: they skip the HTTP sessions, spot list and archive"""
         self.json_file_path = json_file_path
+        self.request_count = 0
+        if offline:
+            return
+
+        self.archive = PageArchive(archive_file_path or json_file_path.replace('.json', '_pages.warc.gz'))
         self.session = requests.Session()
         self.cloudscraper = cloudscraper.create_scraper(
             browser={
@@ -29,9 +390,16 @@ class SurfSpotScraper:
             delay=10,  # Add delay between requests
             allow_brotli=True
         )
+        # Count every HTTP response, including redirects and Cloudflare challenge retries
+        for session in (self.session, self.cloudscraper):
+            session.hooks['response'].append(self.count_request)
         self.setup_session()
         self.spots_data = self.load_json_data()
 
+    def count_request(self, response, *args, **kwargs):
+        """Response hook counting requests made by either session"""
+        self.request_count += 1
+
     def get_random_user_agent(self) -> str:
         """Get a random user agent to avoid detection"""
         user_agents = [
@@ -101,6 +469,13 @@ class SurfSpotScraper:
 
         return None
 
+    def archive_page(self, base_url: str, url: str, response):
+        """Store a fetched page in the archive without letting failures stop the scrape"""
+        try:
+            self.archive.append(base_url, url, response.content, response.status_code)
+        except OSError as e:
+            print(f"Could not archive {url}: {e}")
+
     def get_spot_guide_content(self, base_url: str) -> Optional[BeautifulSoup]:
         """Get content from the spot guide page with advanced bot evasion"""
         # Try spot-guide first
@@ -119,6 +494,7 @@ class SurfSpotScraper:
 
                 if response.status_code == 200:
                     print("✅ Cloudscraper successful!")
+                    self.archive_page(base_url, url, response)
                     return BeautifulSoup(response.content, 'html.parser')
                 else:
                     print(f"Cloudscraper failed: HTTP {response.status_code}")
@@ -135,6 +511,7 @@ class SurfSpotScraper:
 
                 if response.status_code == 200:
                     print("✅ Session fallback successful!")
+                    self.archive_page(base_url, url, response)
                     return BeautifulSoup(response.content, 'html.parser')
                 else:
                     print(f"Session fallback failed: HTTP {response.status_code}")
@@ -302,6 +679,12 @@ class SurfSpotScraper:
             print(f"Could not fetch content for {name}")
             return spot
 
+        return self.enrich_spot(spot, soup)
+
+    def enrich_spot(self, spot: Dict, soup: BeautifulSoup) -> Dict:
+        """Extract characteristics from a spot page and add them to the spot data"""
+        name = spot.get('name', 'Unknown')
+
         # Extract characteristics
         characteristics = self.extract_spot_characteristics(soup)
 
@@ -323,8 +706,9 @@ class SurfSpotScraper:
 
         return enriched_spot
 
-    def process_all_spots(self, test_mode: bool = False, max_spots: int = None) -> List[Dict]:
-        """Process all surf spots or a subset for testing"""
+    def process_all_spots(self, test_mode: bool = False, max_spots: int = None,
+                          scheduler: RefreshScheduler = None) -> List[Dict]:
+        """Process all surf spots or a subset for testing, recording results with the scheduler if given"""
         spots = self.spots_data['surf_spots']
 
         if test_mode and max_spots:
@@ -335,13 +719,11 @@ class SurfSpotScraper:
         print(f"Processing {total_spots} surf spots {'(TEST MODE)' if test_mode else ''}...")
 
         enriched_spots = []
-        gps_mismatches = []
 
         for index, spot in enumerate(spots):
             enriched_spot = self.process_spot(spot, index, total_spots)
-
-            if not enriched_spot.get('gps_verified', True):
-                gps_mismatches.append(enriched_spot)
+            if scheduler:
+                scheduler.record_result(spot, 'surfline_characteristics' in enriched_spot)
 
             enriched_spots.append(enriched_spot)
 
@@ -349,18 +731,155 @@ class SurfSpotScraper:
             if test_mode and index + 1 >= max_spots:
                 break
 
-        # Report GPS mismatches
+        self.report_gps_mismatches(enriched_spots)
+
+        return enriched_spots
+
+    def process_scheduled_spots(self, scheduler: RefreshScheduler, time_budget: float = None,
+                                request_budget: int = None, output_file: str = None) -> List[Dict]:
+        """Refresh the stalest spots first until the time or request budget is spent
+
+        A spot is only started when the most requests any spot has needed
+        so far (at least MAX_REQUESTS_PER_SPOT) still fit in the request
+        budget, so a budget below that refreshes nothing. Spots that are not
+        refreshed keep their enrichment from the previous output file, so the
+        returned list always covers every spot.
+        """
+        previous_data = self.load_previous_output(output_file or self.get_default_output_file())
+        scheduler.seed_from_enrichment(previous_data)
+
+        spots = self.spots_data['surf_spots']
+        due_spots = scheduler.rank_spots(spots)
+        total_spots = len(due_spots)
+
+        print(f"{total_spots} of {len(spots)} surf spots due for refresh...")
+
+        start_time = time.monotonic()
+        start_requests = self.request_count
+        spot_request_reserve = MAX_REQUESTS_PER_SPOT
+        consecutive_failures = 0
+        refreshed_spots = {}
+
+        for index, spot in enumerate(due_spots):
+            elapsed = time.monotonic() - start_time
+            requests_used = self.request_count - start_requests
+
+            # Stop before a spot that would be expected to overrun the time budget
+            expected_time = elapsed / index if index else 0
+            if time_budget is not None and elapsed + expected_time >= time_budget:
+                print(f"\n⏱️  Time budget reached after {index} spot(s)")
+                break
+            if request_budget is not None and requests_used + spot_request_reserve > request_budget:
+                print(f"\n⏱️  Request budget reached after {index} spot(s)")
+                break
+
+            spot_start_requests = self.request_count
+            enriched_spot = self.process_spot(spot, index, total_spots)
+            spot_request_reserve = max(spot_request_reserve, self.request_count - spot_start_requests)
+
+            success = 'surfline_characteristics' in enriched_spot
+            scheduler.record_result(spot, success)
+
+            if success:
+                refreshed_spots[spot['url']] = enriched_spot
+                consecutive_failures = 0
+            else:
+                consecutive_failures += 1
+                # Stop early so an outage or block does not mark every spot as failed
+                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    print(f"\n🛑 {consecutive_failures} spots failed in a row, stopping this run")
+                    break
+
+        self.report_gps_mismatches(refreshed_spots.values())
+
+        print(f"\nRefreshed {len(refreshed_spots)} surf spots "
+              f"in {time.monotonic() - start_time:.0f}s using {self.request_count - start_requests} requests")
+
+        return self.merge_enrichment(refreshed_spots, previous_data)
+
+    def reextract_all_spots(self, max_workers: int = None, output_file: str = None) -> List[Dict]:
+        """Re-run extraction over the latest archived page of every spot, without network access
+
+        Spots with no archived page keep their enrichment from the previous
+        output file.
+        """
+        spots = self.spots_data['surf_spots']
+        jobs = [(spot, self.archive.latest(spot['url'])) for spot in spots]
+        jobs = [(spot, entry) for spot, entry in jobs if entry]
+
+        print(f"Re-extracting {len(jobs)} of {len(spots)} surf spots from {self.archive.archive_file_path}...")
+
+        reextracted_spots = {}
+        if jobs:
+            # Hand each worker a few batches rather than one spot at a time
+            chunksize = max(1, len(jobs) // ((max_workers or os.cpu_count() or 1) * 4))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_reextract_worker,
+                                     initargs=(self.json_file_path, self.archive.archive_file_path)) as executor:
+                results = executor.map(_reextract_spot, *zip(*jobs), chunksize=chunksize)
+                for (spot, _), enriched_spot in zip(jobs, results):
+                    # Unreadable records keep the spot's previous enrichment, like a failed fetch
+                    if enriched_spot is not None:
+                        reextracted_spots[spot['url']] = enriched_spot
+
+        self.report_gps_mismatches(reextracted_spots.values())
+
+        previous_data = self.load_previous_output(output_file or self.get_default_output_file())
+        return self.merge_enrichment(reextracted_spots, previous_data)
+
+    def report_gps_mismatches(self, enriched_spots):
+        """Print the spots whose extracted GPS does not match the source coordinates"""
+        gps_mismatches = [spot for spot in enriched_spots if not spot.get('gps_verified', True)]
         if gps_mismatches:
             print(f"\n⚠️  GPS COORDINATE MISMATCHES FOUND:")
             for spot in gps_mismatches:
                 print(f"   - {spot['name']}")
 
-        return enriched_spots
+    def load_previous_output(self, output_file: str) -> Dict:
+        """Load a previously saved enriched output, if it exists"""
+        if not os.path.exists(output_file):
+            return {}
+
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read previous enrichment {output_file}: {e}")
+            return {}
+
+    def merge_enrichment(self, updated_spots: Dict[str, Dict], previous_data: Dict) -> List[Dict]:
+        """Build the full spot list from the current source JSON
+
+        Spots updated in this run use their new enrichment. The others take
+        only the Surfline characteristics from the previous output, so name
+        or GPS fixes in the source JSON are never overwritten by stale copies.
+        """
+        previous_spots = {spot['url']: spot for spot in previous_data.get('surf_spots', []) if 'url' in spot}
+
+        merged_spots = []
+        for spot in self.spots_data['surf_spots']:
+            if spot['url'] in updated_spots:
+                merged_spots.append(updated_spots[spot['url']])
+                continue
+
+            merged_spot = spot.copy()
+            previous_spot = previous_spots.get(spot['url'], {})
+            if 'surfline_characteristics' in previous_spot:
+                characteristics = previous_spot['surfline_characteristics']
+                merged_spot['surfline_characteristics'] = characteristics
+                merged_spot['gps_verified'] = self.verify_gps_coordinates(spot['gps'],
+                                                                          characteristics.get('extracted_gps'))
+            merged_spots.append(merged_spot)
+
+        return merged_spots
+
+    def get_default_output_file(self) -> str:
+        """Get the default path for the enriched JSON output"""
+        return self.json_file_path.replace('.json', '_enriched.json')
 
     def save_enriched_data(self, enriched_spots: List[Dict], output_file: str = None):
         """Save the enriched data back to JSON"""
         if not output_file:
-            output_file = self.json_file_path.replace('.json', '_enriched.json')
+            output_file = self.get_default_output_file()
 
         enriched_data = {
             'source_info': self.spots_data['source_info'],
@@ -382,7 +901,53 @@ def main():
     import sys
 
     # Path to the JSON file
-    json_file = "/Users/frederic/github/lavolcanica/docs/surf-spots-coordinates-google-map/surfline fuerteventura surf spots.json"
+    json_file = SPOTS_JSON_FILE
+    # Every fetching run records its results so budgeted runs skip fresh spots
+    state_file = json_file.replace('.json', '_refresh_state.json')
+
+    # Offline re-extraction of archived pages: --reextract [--workers N]
+    if "--reextract" in sys.argv:
+        max_workers = None
+        if "--workers" in sys.argv:
+            try:
+                max_workers = int(sys.argv[sys.argv.index("--workers") + 1])
+            except (IndexError, ValueError):
+                pass
+            if not max_workers or max_workers < 1:
+                print("Invalid number of workers. Using one per CPU.")
+                max_workers = None
+
+        scraper = SurfSpotScraper(json_file)
+
+        print("📦 RE-EXTRACT MODE: No network requests will be made")
+        enriched_spots = scraper.reextract_all_spots(max_workers)
+        output_file = scraper.save_enriched_data(enriched_spots)
+
+        print(f"\n✅ Completed re-extraction of {len(enriched_spots)} surf spots")
+        print(f"📄 Output saved to: {output_file}")
+        return
+
+    # Budgeted refresh: --budget 10m (wall clock) or --budget 40req (HTTP requests)
+    if "--budget" in sys.argv:
+        try:
+            time_budget, request_budget = parse_budget(sys.argv[sys.argv.index("--budget") + 1])
+            min_age = DEFAULT_MIN_REFRESH_AGE
+            if "--min-age" in sys.argv:
+                min_age = parse_duration(sys.argv[sys.argv.index("--min-age") + 1])
+        except (IndexError, ValueError) as e:
+            print(f"Invalid budget arguments: {e}")
+            sys.exit(1)
+
+        scraper = SurfSpotScraper(json_file)
+        scheduler = RefreshScheduler(state_file, min_age)
+
+        print(f"⏱️  BUDGET MODE: {sys.argv[sys.argv.index('--budget') + 1]}")
+        enriched_spots = scraper.process_scheduled_spots(scheduler, time_budget, request_budget)
+        output_file = scraper.save_enriched_data(enriched_spots)
+
+        print(f"\n✅ Completed budgeted refresh of {len(enriched_spots)} surf spots")
+        print(f"📄 Output saved to: {output_file}")
+        return
 
     # Check for test mode command line arguments
     test_mode = "--test" in sys.argv
@@ -398,17 +963,19 @@ def main():
 
     # Create scraper instance
     scraper = SurfSpotScraper(json_file)
+    scheduler = RefreshScheduler(state_file)
 
     if test_mode:
         print(f"🧪 TEST MODE: Processing only {max_spots} spot(s)")
         # Process test spots
-        enriched_spots = scraper.process_all_spots(test_mode=True, max_spots=max_spots)
+        enriched_spots = scraper.process_all_spots(test_mode=True, max_spots=max_spots,
+                                                   scheduler=scheduler)
         # Save test output
         output_file = scraper.save_enriched_data(enriched_spots,
                                                 json_file.replace('.json', f'_test_{max_spots}.json'))
     else:
         # Process all spots
-        enriched_spots = scraper.process_all_spots()
+        enriched_spots = scraper.process_all_spots(scheduler=scheduler)
         # Save enriched data
         output_file = scraper.save_enriched_data(enriched_spots)
 
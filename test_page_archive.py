@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test the compressed, indexed page archive and offline re-extraction
+"""
+
+import gzip
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import requests
+
+import surf_spot_scraper
+from surf_spot_scraper import PageArchive, SurfSpotScraper
+
+SPOT_URL = 'https://www.surfline.com/surf-report/rocky-point/584204204e65fad6a77096a0'
+GUIDE_URL = SPOT_URL + '/spot-guide'
+
+SPOTS = [
+    {'name': 'Rocky Point', 'gps': {'latitude': 28.7497, 'longitude': -13.8589}, 'url': SPOT_URL},
+    {'name': 'El Hierro', 'gps': {'latitude': 28.7462, 'longitude': -13.9329},
+     'url': 'https://www.surfline.com/surf-report/el-hierro/4'},
+    {'name': 'Shipwreck', 'gps': {'latitude': 28.3464, 'longitude': -14.1784},
+     'url': 'https://www.surfline.com/surf-report/shipwreck/1'},
+]
+
+SPOT_GUIDE_PAGE = b'''<html><body>
+<a href="https://www.google.com/maps/@28.7497,-13.8589,15z">Map</a>
+<h3>Ideal Surf Conditions</h3><p>North swell with light south winds</p>
+<h3>Bottom</h3><p>Lava reef with sharp urchins</p>
+</body></html>'''
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """An empty archive in a temporary directory"""
+    return PageArchive(str(tmp_path / 'pages.warc.gz'))
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    """A scraper over SPOTS with its archive in a temporary directory"""
+    json_file = tmp_path / 'spots.json'
+    json_file.write_text(json.dumps({'source_info': {}, 'surf_spots': SPOTS}), encoding='utf-8')
+    return SurfSpotScraper(str(json_file))
+
+
+def test_append_and_read_round_trip(archive):
+    """Archived pages read back byte for byte through the memory map"""
+    first = archive.append(SPOT_URL, GUIDE_URL, b'<html>first</html>', fetch_time=100)
+    second = archive.append(SPOT_URL, SPOT_URL, '<html>sécond\r\n\r\n</html>'.encode('utf-8'), fetch_time=200)
+
+    assert archive.read(first) == b'<html>first</html>'
+    assert archive.read(second) == '<html>sécond\r\n\r\n</html>'.encode('utf-8')
+    archive.close()
+
+    # Each record is a gzip member, so the whole archive stays a valid .gz file
+    with gzip.open(archive.archive_file_path) as f:
+        assert b'WARC-Target-URI: ' + GUIDE_URL.encode('utf-8') in f.read()
+
+
+def test_latest_by_fetch_time(archive):
+    """The index finds the most recent page for a spot, optionally before a time"""
+    archive.append(SPOT_URL, GUIDE_URL, b'<html>old</html>', fetch_time=100)
+    archive.append(SPOT_URL, GUIDE_URL, b'<html>new</html>', fetch_time=200)
+
+    reopened = PageArchive(archive.archive_file_path)
+    assert reopened.read(reopened.latest(SPOT_URL)) == b'<html>new</html>'
+    assert reopened.read(reopened.latest(SPOT_URL, before=150)) == b'<html>old</html>'
+    assert reopened.latest(SPOT_URL, before=50) is None
+    assert reopened.latest('https://www.surfline.com/unknown') is None
+    reopened.close()
+
+
+def test_bad_index_lines_are_skipped(archive):
+    """Truncated or incomplete index lines do not stop the index from loading"""
+    archive.append(SPOT_URL, GUIDE_URL, b'<html>kept</html>', fetch_time=100)
+    with open(archive.index_file_path, 'a', encoding='utf-8') as f:
+        f.write('{"spot_url": "https://www.surfline.com/other"}\n')
+        f.write('{"spot_url": "' + SPOT_URL)
+
+    reopened = PageArchive(archive.archive_file_path)
+    assert list(reopened.index) == [SPOT_URL]
+    assert reopened.read(reopened.latest(SPOT_URL)) == b'<html>kept</html>'
+    reopened.close()
+
+
+def test_missing_or_truncated_archive_reads_none(archive):
+    """Reading from a missing or truncated archive returns None instead of raising"""
+    entry = archive.append(SPOT_URL, GUIDE_URL, b'<html>page</html>' * 100, fetch_time=100)
+
+    with open(archive.archive_file_path, 'r+b') as f:
+        f.truncate(entry['length'] // 2)
+    assert PageArchive(archive.archive_file_path).read(entry) is None
+    assert PageArchive(archive.archive_file_path).read(dict(entry, offset=entry['length'])) is None
+
+    os.remove(archive.archive_file_path)
+    assert PageArchive(archive.archive_file_path).read(entry) is None
+
+
+def test_fetched_pages_are_archived(scraper, monkeypatch):
+    """Pages fetched for a spot are archived under the spot URL"""
+    class FakeResponse:
+        status_code = 200
+        content = SPOT_GUIDE_PAGE
+
+    monkeypatch.setattr(surf_spot_scraper.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(scraper.cloudscraper, 'get', lambda url, timeout: FakeResponse())
+
+    assert scraper.get_spot_guide_content(SPOT_URL) is not None
+    entry = scraper.archive.latest(SPOT_URL)
+    assert entry['url'] == GUIDE_URL
+    assert scraper.archive.read(entry) == SPOT_GUIDE_PAGE
+
+
+def test_reextract_all_spots(scraper):
+    """Re-extraction runs the current extraction in worker processes and keeps unreadable spots"""
+    scraper.archive.append(SPOT_URL, GUIDE_URL, SPOT_GUIDE_PAGE)
+    # El Hierro's index entry points past the end of the archive
+    broken = scraper.archive.append(SPOTS[1]['url'], SPOTS[1]['url'], b'<html>lost</html>')
+    scraper.archive.index[SPOTS[1]['url']][-1] = dict(broken, offset=broken['offset'] + 10 ** 6)
+
+    with open(scraper.get_default_output_file(), 'w', encoding='utf-8') as f:
+        json.dump({'surf_spots': [dict(SPOTS[1], surfline_characteristics={'bottom_type': 'Reef'})]}, f)
+
+    enriched_spots = scraper.reextract_all_spots(max_workers=2)
+
+    characteristics = enriched_spots[0]['surfline_characteristics']
+    assert characteristics['ideal_conditions'] == 'North swell with light south winds'
+    assert characteristics['bottom_type'] == 'Lava reef with sharp urchins'
+    assert enriched_spots[0]['gps_verified'] is True
+    assert enriched_spots[1]['surfline_characteristics'] == {'bottom_type': 'Reef'}
+    assert enriched_spots[2] == SPOTS[2]
+
+
+def test_reextract_command_is_offline(scraper, monkeypatch):
+    """--reextract saves extracted data without any network request, and rejects --workers 0"""
+    scraper.archive.append(SPOT_URL, GUIDE_URL, SPOT_GUIDE_PAGE)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("--reextract made a network request")
+
+    monkeypatch.setattr(requests.Session, 'send', no_network)
+    monkeypatch.setattr(surf_spot_scraper, 'SPOTS_JSON_FILE', scraper.json_file_path)
+    monkeypatch.setattr(sys, 'argv', ['surf_spot_scraper.py', '--reextract', '--workers', '0'])
+
+    surf_spot_scraper.main()
+
+    with open(scraper.get_default_output_file(), 'r', encoding='utf-8') as f:
+        enriched_spots = json.load(f)['surf_spots']
+    assert enriched_spots[0]['surfline_characteristics']['bottom_type'] == 'Lava reef with sharp urchins'
+    assert 'surfline_characteristics' not in enriched_spots[1]
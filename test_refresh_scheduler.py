@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Test budget parsing, the staleness-aware refresh scheduler and budgeted runs
+"""
+
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import surf_spot_scraper
+from surf_spot_scraper import (MAX_REQUESTS_PER_SPOT, RefreshScheduler, SurfSpotScraper,
+                               parse_budget, parse_duration)
+
+DAY = 24 * 3600
+
+SPOTS = [
+    {'name': 'Shipwreck', 'gps': {'latitude': 28.3464, 'longitude': -14.1784},
+     'url': 'https://www.surfline.com/surf-report/shipwreck/1'},
+    {'name': 'Playa de Cofete', 'gps': {'latitude': 28.1118, 'longitude': -14.3902},
+     'url': 'https://www.surfline.com/surf-report/playa-de-cofete/2'},
+    {'name': 'Rocky Point', 'gps': {'latitude': 28.7497, 'longitude': -13.8589},
+     'url': 'https://www.surfline.com/surf-report/rocky-point/3'},
+    {'name': 'El Hierro', 'gps': {'latitude': 28.7462, 'longitude': -13.9329},
+     'url': 'https://www.surfline.com/surf-report/el-hierro/4'},
+]
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """A scheduler with a one day minimum refresh age"""
+    return RefreshScheduler(str(tmp_path / 'refresh_state.json'), min_age=DAY)
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """A scraper over SPOTS whose fetches are faked, see fetched_urls and failing_urls"""
+    json_file = tmp_path / 'spots.json'
+    json_file.write_text(json.dumps({'source_info': {}, 'surf_spots': SPOTS}), encoding='utf-8')
+    scraper = SurfSpotScraper(str(json_file))
+    scraper.fetched_urls = []
+    scraper.failing_urls = set()
+    scraper.requests_per_spot = MAX_REQUESTS_PER_SPOT
+
+    def fake_process_spot(spot, index, total):
+        scraper.fetched_urls.append(spot['url'])
+        scraper.request_count += scraper.requests_per_spot
+        if spot['url'] in scraper.failing_urls:
+            return spot
+        return dict(spot, surfline_characteristics={'wave_type': 'reef break'}, gps_verified=True)
+
+    monkeypatch.setattr(scraper, 'process_spot', fake_process_spot)
+    return scraper
+
+
+def test_parse_duration():
+    """Durations accept seconds, minutes, hours and days"""
+    assert parse_duration('90') == 90
+    assert parse_duration('90s') == 90
+    assert parse_duration('10m') == 600
+    assert parse_duration('1.5h') == 5400
+    assert parse_duration('2d') == 2 * DAY
+    with pytest.raises(ValueError):
+        parse_duration('soon')
+
+
+def test_parse_budget():
+    """Budgets are either wall-clock durations or request counts"""
+    assert parse_budget('10m') == (600, None)
+    assert parse_budget('40req') == (None, 40)
+    assert parse_budget('40 requests') == (None, 40)
+    assert parse_budget('0s') == (0, None)
+
+
+def test_new_spots_are_due_in_file_order(scheduler):
+    """Spots never seen before are all due and start equally stale"""
+    ranked = scheduler.rank_spots(SPOTS, now=1000)
+    assert [spot['name'] for spot in ranked] == [spot['name'] for spot in SPOTS]
+
+
+def test_fresh_spots_are_skipped_and_stalest_first(scheduler):
+    """Spots enriched within min_age are skipped, the stalest come first"""
+    now = 10 * DAY
+    scheduler.record_result(SPOTS[0], True, now=now - 2 * DAY)
+    scheduler.record_result(SPOTS[1], True, now=now - 5 * DAY)
+    scheduler.record_result(SPOTS[2], True, now=now - DAY / 2)
+    scheduler.record_result(SPOTS[3], True, now=now - DAY / 2)
+
+    ranked = scheduler.rank_spots(SPOTS, now=now)
+    assert [spot['name'] for spot in ranked] == ['Playa de Cofete', 'Shipwreck']
+
+
+def test_priority_weights_staleness(scheduler):
+    """A higher priority spot outranks a staler one, invalid priorities fall back to 1.0"""
+    now = 10 * DAY
+    spots = [dict(SPOTS[0]), dict(SPOTS[1], priority=3), dict(SPOTS[2], priority='high')]
+    scheduler.record_result(spots[0], True, now=now - 4 * DAY)
+    scheduler.record_result(spots[1], True, now=now - 2 * DAY)
+    scheduler.record_result(spots[2], True, now=now - 3 * DAY)
+
+    ranked = scheduler.rank_spots(spots, now=now)
+    assert [spot['name'] for spot in ranked] == ['Playa de Cofete', 'Shipwreck', 'Rocky Point']
+
+
+def test_failing_spots_back_off_briefly(scheduler):
+    """A failing spot is retried after a short backoff, not after min_age"""
+    spot = SPOTS[0]
+    scheduler.record_result(spot, False, now=0)
+    assert scheduler.rank_spots([spot], now=10 * 60) == []
+    assert scheduler.rank_spots([spot], now=15 * 60) == [spot]
+
+    scheduler.record_result(spot, False, now=0)
+    assert scheduler.rank_spots([spot], now=15 * 60) == []
+    assert scheduler.rank_spots([spot], now=30 * 60) == [spot]
+
+    for _ in range(20):
+        scheduler.record_result(spot, False, now=0)
+    assert scheduler.rank_spots([spot], now=6 * 3600) == [spot]
+
+
+def test_state_persists_between_runs(scheduler):
+    """A new scheduler picks up the state saved by a previous run"""
+    scheduler.record_result(SPOTS[0], True, now=1000)
+
+    reopened = RefreshScheduler(scheduler.state_file_path, min_age=DAY)
+    assert reopened.get_spot_state(SPOTS[0])['last_success'] == 1000
+    assert reopened.rank_spots([SPOTS[0]], now=1000 + DAY / 2) == []
+
+
+def test_overlapping_schedulers_keep_each_others_updates(scheduler):
+    """Saving merges per-spot changes instead of overwriting the whole file"""
+    other = RefreshScheduler(scheduler.state_file_path, min_age=DAY)
+    scheduler.record_result(SPOTS[0], True, now=1000)
+    other.record_result(SPOTS[1], True, now=2000)
+
+    reopened = RefreshScheduler(scheduler.state_file_path, min_age=DAY)
+    assert reopened.get_spot_state(SPOTS[0])['last_success'] == 1000
+    assert reopened.get_spot_state(SPOTS[1])['last_success'] == 2000
+
+
+def test_request_budget_reserves_worst_case(scraper, scheduler):
+    """A spot only starts when MAX_REQUESTS_PER_SPOT still fit in the budget"""
+    scraper.process_scheduled_spots(scheduler, request_budget=MAX_REQUESTS_PER_SPOT - 1)
+    assert scraper.fetched_urls == []
+
+    scraper.process_scheduled_spots(scheduler, request_budget=2 * MAX_REQUESTS_PER_SPOT)
+    assert scraper.fetched_urls == [SPOTS[0]['url'], SPOTS[1]['url']]
+
+
+def test_request_budget_reserves_largest_spot_seen(scraper, scheduler):
+    """Spots needing extra requests, such as Cloudflare challenges, raise the reserve"""
+    scraper.requests_per_spot = MAX_REQUESTS_PER_SPOT + 2
+    scraper.process_scheduled_spots(scheduler, request_budget=2 * MAX_REQUESTS_PER_SPOT + 2)
+    assert scraper.fetched_urls == [SPOTS[0]['url']]
+
+
+def test_time_budget(scraper, scheduler, monkeypatch):
+    """The run stops before a spot expected to overrun the time budget, a zero budget fetches nothing"""
+    clock = [0.0]
+    monkeypatch.setattr(surf_spot_scraper.time, 'monotonic', lambda: clock[0])
+    original_process_spot = scraper.process_spot
+
+    def slow_process_spot(spot, index, total):
+        clock[0] += 100
+        return original_process_spot(spot, index, total)
+
+    monkeypatch.setattr(scraper, 'process_spot', slow_process_spot)
+
+    scraper.process_scheduled_spots(scheduler, time_budget=0)
+    assert scraper.fetched_urls == []
+
+    scraper.process_scheduled_spots(scheduler, time_budget=250)
+    assert scraper.fetched_urls == [SPOTS[0]['url'], SPOTS[1]['url']]
+
+
+def test_results_are_recorded(scraper, scheduler):
+    """Successes and failures of a budgeted run are saved in the refresh state"""
+    scraper.failing_urls = {SPOTS[1]['url']}
+    scraper.process_scheduled_spots(scheduler, request_budget=2 * MAX_REQUESTS_PER_SPOT)
+
+    reopened = RefreshScheduler(scheduler.state_file_path, min_age=DAY)
+    assert reopened.get_spot_state(SPOTS[0])['failures'] == 0
+    assert 'last_success' in reopened.get_spot_state(SPOTS[0])
+    assert reopened.get_spot_state(SPOTS[1])['failures'] == 1
+    assert 'last_success' not in reopened.get_spot_state(SPOTS[1])
+
+
+def test_full_runs_record_results(scraper, scheduler):
+    """Full and test runs update the refresh state so budgeted runs skip their spots"""
+    scraper.process_all_spots(test_mode=True, max_spots=2, scheduler=scheduler)
+    due_spots = scheduler.rank_spots(SPOTS)
+    assert [spot['url'] for spot in due_spots] == [SPOTS[2]['url'], SPOTS[3]['url']]
+
+
+def test_consecutive_failures_stop_the_run(scraper, scheduler):
+    """An outage stops the run instead of marking every spot as failed"""
+    scraper.failing_urls = {spot['url'] for spot in SPOTS}
+    scraper.process_scheduled_spots(scheduler)
+    assert len(scraper.fetched_urls) == surf_spot_scraper.MAX_CONSECUTIVE_FAILURES
+    assert 'last_attempt' not in scheduler.get_spot_state(SPOTS[-1])
+
+
+def test_previous_enrichment_is_seeded_and_merged(scraper, scheduler):
+    """Spots enriched by a previous run are not refetched and keep only their characteristics"""
+    output_file = scraper.get_default_output_file()
+    previous_spots = [
+        dict(spot, name='Old ' + spot['name'], gps={'latitude': 0.0, 'longitude': 0.0},
+             surfline_characteristics={'wave_type': 'point break'}, gps_verified=True)
+        for spot in SPOTS[1:]
+    ]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({'enrichment_info': {'enrichment_date': time.strftime('%Y-%m-%d %H:%M:%S')},
+                   'surf_spots': previous_spots}, f)
+
+    enriched_spots = scraper.process_scheduled_spots(scheduler)
+
+    # Only the spot missing from the previous output is fetched
+    assert scraper.fetched_urls == [SPOTS[0]['url']]
+    assert enriched_spots[0]['surfline_characteristics'] == {'wave_type': 'reef break'}
+    for spot, enriched_spot in zip(SPOTS[1:], enriched_spots[1:]):
+        assert enriched_spot['name'] == spot['name']
+        assert enriched_spot['gps'] == spot['gps']
+        assert enriched_spot['surfline_characteristics'] == {'wave_type': 'point break'}